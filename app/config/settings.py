@@ -24,6 +24,13 @@ class Settings(BaseSettings):
     # 리랭킹 모델
     reranker_model: str = os.environ.get("RERANKER_MODEL", "BAAI/bge-reranker-v2-m3")
     
+    # 벡터/BM25 상위 결과가 충분히 일치하면(Jaccard@top_k) 재정렬 생략
+    rerank_skip_on_agreement: bool = os.environ.get("RERANK_SKIP_ON_AGREEMENT", False)
+    rerank_agreement_threshold: float = os.environ.get("RERANK_AGREEMENT_THRESHOLD", 0.8)
+    
+    # 공백 없는 짧은 단일 토큰 쿼리도 리터럴로 보고 BM25만 사용 (의미 검색 단어까지 포함되므로 기본 비활성)
+    rerank_skip_single_token: bool = os.environ.get("RERANK_SKIP_SINGLE_TOKEN", False)
+    
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
@@ -1,7 +1,8 @@
 """하이브리드 검색 결과 재정렬을 위한 Cross-Encoder 모델"""
 from langchain.retrievers.document_compressors import CrossEncoderReranker
 from langchain_community.cross_encoders import HuggingFaceCrossEncoder
-from typing import List, Dict, Tuple, Any
+from typing import List, Dict, Tuple, Any, Optional
+import asyncio
 import logging
 from app.models.search_model import SearchResult
 from app.config.settings import get_settings
@@ -13,6 +14,10 @@ logger = logging.getLogger(__name__)
 _cross_encoder = None
 _reranker = None
 
+# 동시 요청의 (쿼리, 문서) 쌍을 모아 한 번에 추론하기 위한 배치 설정
+RERANK_MAX_BATCH_SIZE = 64     # 한 번의 forward 호출에 넣을 최대 쌍 개수
+RERANK_MAX_WAIT_SEC = 0.005    # 첫 요청 이후 다른 요청을 기다리는 최대 시간
+
 def init_reranker():
     settings = get_settings()
     """크로스 인코더 모델 초기화"""
@@ -35,9 +40,138 @@ def init_reranker():
         _cross_encoder = None
         _reranker = None
 
-def rerank_results(query: str, docs: List[SearchResult], top_k: int = None) -> List[SearchResult]:
+def _sort_by_score(docs: List[SearchResult], top_k: int = None) -> List[SearchResult]:
+    """점수 기준으로 정렬 후 top_k개로 제한"""
+    sorted_docs = sorted(docs, key=lambda doc: doc.score, reverse=True)
+    if top_k:
+        return sorted_docs[:top_k]
+    return sorted_docs
+
+
+def _keep_input_order(docs: List[SearchResult], top_k: int = None) -> List[SearchResult]:
+    """재정렬을 할 수 없을 때의 폴백 - 입력 순서(RRF 등 호출자의 순위)를 유지
+
+    입력 문서의 점수는 벡터(코사인)와 BM25(상한 없음)가 섞여 있어 점수로 다시 정렬하면 안 된다.
+    """
+    if top_k:
+        return docs[:top_k]
+    return list(docs)
+
+
+class _RerankBatcher:
+    """동시 요청의 (쿼리, 문서) 쌍을 모아 크로스 인코더를 한 번에 호출하는 마이크로배처
+
+    요청마다 forward를 따로 실행하는 대신, 짧은 대기 시간 동안 들어온 쌍들을
+    최대 RERANK_MAX_BATCH_SIZE 개까지 합쳐서 점수를 계산한 뒤 요청별로 나눠 돌려준다.
+    단일 요청이 상한보다 크면 그 요청만 단독으로 처리한다.
+    """
+
+    def __init__(self, max_batch_size: int = RERANK_MAX_BATCH_SIZE, max_wait_sec: float = RERANK_MAX_WAIT_SEC):
+        self.max_batch_size = max_batch_size
+        self.max_wait_sec = max_wait_sec
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._carry = None  # 상한 초과로 다음 배치로 넘긴 요청
+
+    def _ensure_worker(self):
+        """현재 이벤트 루프에 워커 태스크가 없으면 생성"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._carry = None
+            self._worker = loop.create_task(self._run())
+
+    async def score(self, pairs: List[List[str]]) -> List[float]:
+        """(쿼리, 문서) 쌍 목록의 점수를 배치 큐를 통해 계산"""
+        if not pairs:
+            return []
+        self._ensure_worker()
+        future = self._loop.create_future()
+        await self._queue.put((pairs, future))
+        return await future
+
+    async def _collect(self) -> list:
+        """대기 시간 안에 들어온 요청을 쌍 개수 상한까지 모으기"""
+        if self._carry is not None:
+            items, self._carry = [self._carry], None
+        else:
+            items = [await self._queue.get()]
+        pair_count = len(items[0][0])
+        deadline = self._loop.time() + self.max_wait_sec
+
+        while pair_count < self.max_batch_size:
+            timeout = deadline - self._loop.time()
+            if timeout <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(self._queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            if pair_count + len(item[0]) > self.max_batch_size:
+                # 상한을 넘기는 요청은 다음 배치의 첫 요청으로 넘김
+                self._carry = item
+                break
+            items.append(item)
+            pair_count += len(item[0])
+        return items
+
+    async def _run(self):
+        while True:
+            items = await self._collect()
+            all_pairs = [pair for pairs, _ in items for pair in pairs]
+            try:
+                scores = await asyncio.to_thread(_score_pairs, all_pairs)
+            except Exception as e:
+                if len(items) == 1:
+                    _set_exception(items[0][1], e)
+                    continue
+                # 배치 실패가 다른 요청까지 실패시키지 않도록 요청별로 다시 계산
+                logger.warning(f"배치 재정렬 실패, 요청별로 재시도: {str(e)}")
+                for pairs, future in items:
+                    try:
+                        _set_result(future, await asyncio.to_thread(_score_pairs, pairs))
+                    except Exception as item_error:
+                        _set_exception(future, item_error)
+                continue
+
+            offset = 0
+            for pairs, future in items:
+                _set_result(future, scores[offset:offset + len(pairs)])
+                offset += len(pairs)
+
+
+def _set_result(future: asyncio.Future, result) -> None:
+    if not future.done():
+        future.set_result(result)
+
+
+def _set_exception(future: asyncio.Future, error: Exception) -> None:
+    if not future.done():
+        future.set_exception(error)
+
+
+def _score_pairs(pairs: List[List[str]]) -> List[float]:
+    """크로스 인코더로 쌍 목록의 점수를 한 번에 계산
+
+    길이가 비슷한 쌍끼리 내부 배치에 묶이도록 문서 길이 순으로 정렬해 패딩 낭비를 줄이고,
+    결과는 원래 순서로 되돌려 반환한다.
+    """
+    order = sorted(range(len(pairs)), key=lambda i: len(pairs[i][1]))
+    sorted_scores = _cross_encoder.score([pairs[i] for i in order])
+    scores = [0.0] * len(pairs)
+    for position, i in enumerate(order):
+        scores[i] = float(sorted_scores[position])
+    return scores
+
+
+_batcher = _RerankBatcher()
+
+
+async def arerank_results(query: str, docs: List[SearchResult], top_k: int = None) -> Tuple[List[SearchResult], bool]:
     """
-    검색 결과를 크로스 인코더로 재정렬
+    검색 결과를 크로스 인코더로 재정렬 - 동시 요청의 쌍은 마이크로배치로 묶어 계산
     
     Args:
         query: 사용자 검색 쿼리
@@ -45,65 +179,26 @@ def rerank_results(query: str, docs: List[SearchResult], top_k: int = None) -> L
         top_k: 반환할 최대 결과 수 (None이면 모든 결과 반환)
         
     Returns:
-        점수 순으로 재정렬된 SearchResult 목록
+        (점수 순으로 정렬된 SearchResult 목록, 크로스 인코더 재정렬 성공 여부)
+        모델이 없거나 점수 계산에 실패하면 입력 순서를 유지한 목록과 False를 반환
     """
-    # 완전히 새로운 방식으로 구현
-    # 모델이 없으면 원래 점수로 정렬해서 반환
     if _reranker is None or _cross_encoder is None:
-        logger.warning("크로스 인코더 모델이 초기화되지 않았습니다. 점수 기준으로만 정렬합니다.")
-        # 그냥 원래 점수로 정렬해서 반환
-        sorted_docs = sorted(docs, key=lambda doc: doc.score, reverse=True)
-        if top_k:
-            return sorted_docs[:top_k]
-        return sorted_docs
+        logger.warning("크로스 인코더 모델이 초기화되지 않았습니다. 입력 순서를 유지합니다.")
+        return _keep_input_order(docs, top_k), False
     
     try:
-        # 1. 직접 크로스 인코더 사용하여 점수 계산
-        logger.info(f"크로스 인코더 재정렬 시작: {len(docs)} 개 문서")
-        
-        # 새 배열에 문서를 저장하여 인덱스 추적
-        scored_docs = []
-        
-        # 문서마다 크로스 인코더로 점수 계산
-        if _cross_encoder is not None:
-            for i, doc in enumerate(docs):
-                try:
-                    # 쿼리와 문서 내용으로 점수 계산
-                    pair = [[query, doc.page_content]]
-                    score = _cross_encoder.score(pair)[0]  # score 메서드 사용
-                    
-                    # 새로운 문서 객체 생성
-                    scored_doc = SearchResult(
-                        page_content=doc.page_content,
-                        metadata=doc.metadata,
-                        score=score  # 새 점수로 바꾸기
-                    )
-                    scored_docs.append(scored_doc)
-                except Exception as e:
-                    logger.warning(f"문서 {i} 점수 계산 중 오류: {str(e)}")
-                    # 오류 발생 시 원본 문서 사용
-                    scored_docs.append(doc)
-            
-            # 점수 기준으로 정렬
-            scored_docs.sort(key=lambda d: d.score, reverse=True)
-            logger.info(f"크로스 인코더 재정렬 완료: {len(scored_docs)} 개 결과")
-        else:
-            # 크로스 인코더가 없으면 원본 독서 사용
-            scored_docs = sorted(docs, key=lambda d: d.score, reverse=True)
-            logger.info("크로스 인코더 없음 - 원본 점수로 정렬")
-        
-        # 3. top_k가 지정되었다면 결과 개수 제한
-        if top_k and len(scored_docs) > top_k:
-            return scored_docs[:top_k]
-        
-        return scored_docs
-        
+        logger.debug("크로스 인코더 배치 재정렬 시작: %d 개 문서", len(docs))
+        scores = await _batcher.score([[query, doc.page_content] for doc in docs])
     except Exception as e:
-        logger.error(f"재정렬 중 오류 발생: {str(e)}", exc_info=True)
-        # 오류 발생 시 원래 순서와 점수 유지
-        if top_k:
-            return sorted(docs, key=lambda doc: doc.score, reverse=True)[:top_k]
-        return sorted(docs, key=lambda doc: doc.score, reverse=True)
+        logger.error(f"재정렬 중 오류 발생 - 입력 순서로 반환: {str(e)}", exc_info=True)
+        return _keep_input_order(docs, top_k), False
+    
+    scored_docs = [
+        SearchResult(page_content=doc.page_content, metadata=doc.metadata, score=score)
+        for doc, score in zip(docs, scores)
+    ]
+    logger.debug("크로스 인코더 배치 재정렬 완료: %d 개 결과", len(scored_docs))
+    return _sort_by_score(scored_docs, top_k), True
 
 # 모듈 로드 시 모델 초기화
-init_reranker()
+init_reranker()
\ No newline at end of file
@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 from typing import List, Dict, Any, Optional
+import asyncio
 import sys
 import uuid
 import logging
@@ -88,7 +89,15 @@ def _get_store_for_index(index_name: str) -> OpenSearchVectorSearch:
 # ──────────────────────────────────────────────────────────────
 
 async def add_documents(index_name: str, docs: List[Document]) -> List[str]:
-    """텍스트+메타데이터를 인덱스에 비동기적으로 추가 (직접 임베딩 계산)."""
+    """텍스트+메타데이터를 인덱스에 비동기적으로 추가 (직접 임베딩 계산).
+
+    임베딩 계산과 색인 요청은 블로킹 작업이므로 워커 스레드에서 실행해 이벤트 루프를 막지 않는다.
+    """
+    return await asyncio.to_thread(_add_documents_sync, index_name, docs)
+
+
+def _add_documents_sync(index_name: str, docs: List[Document]) -> List[str]:
+    """add_documents의 동기 구현 (문서별 임베딩 계산 후 OpenSearch에 색인)."""
     if _os_client is None:
         raise RuntimeError("OpenSearch client not initialized")
     
@@ -188,13 +197,28 @@ def similarity_search(query_vector, index_name: str, k: int = 10):
         raise
 
 
-def bm25_search(query: str, index_name: str, k: int = 10):
-    """문서 키워드 검색 (BM25 알고리즘 사용)"""
+def bm25_search(query: str, index_name: str, k: int = 10, phrase: bool = False, fields: Optional[List[str]] = None):
+    """문서 키워드 검색 (BM25 알고리즘 사용)
+
+    phrase=True이면 content 구문 일치 검색, fields를 지정하면 content 대신
+    해당 keyword 필드(파일명 등)에 대한 정확 일치(term) 검색을 수행한다.
+    """
     if _os_client is None:
         raise RuntimeError("Vector store not initialized")
     
-    # BM25 쿼리 구성
-    body = {"size": k, "query": {"match": {"content": query}}}
+    if fields:
+        # keyword 필드 중 하나라도 정확히 일치하는 문서
+        query_body = {
+            "bool": {
+                "should": [{"term": {field: query}} for field in fields],
+                "minimum_should_match": 1,
+            }
+        }
+    else:
+        # BM25 쿼리 구성 (구문 검색은 단어 순서와 인접성까지 일치해야 함)
+        query_type = "match_phrase" if phrase else "match"
+        query_body = {query_type: {"content": query}}
+    body = {"size": k, "query": query_body}
     
     try:
         # OpenSearch에 쿼리 요청
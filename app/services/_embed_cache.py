@@ -0,0 +1,23 @@
+"""쿼리 임베딩 LRU 캐시."""
+from functools import lru_cache
+from typing import List
+
+import numpy as np
+
+from app.models.embedding_model import embedding_model
+
+# 캐시할 최대 쿼리 수 (1024차원 float32 기준 약 16MB)
+EMBED_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=EMBED_CACHE_SIZE)
+def _embed_query_cached(query: str) -> np.ndarray:
+    """쿼리 문자열을 키로 임베딩을 계산하고 읽기 전용 배열로 보관"""
+    vector = np.asarray(embedding_model.embed_query(query), dtype=np.float32)
+    vector.setflags(write=False)  # 캐시된 벡터가 호출자에 의해 변경되지 않도록 보호
+    return vector
+
+
+def get_cached_embedding(query: str) -> List[float]:
+    """캐시를 거쳐 쿼리 임베딩을 반환 (동일 쿼리 반복 시 모델 추론 생략)"""
+    return _embed_query_cached(query).tolist()
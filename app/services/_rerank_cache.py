@@ -0,0 +1,43 @@
+"""재정렬 결과 TTL 캐시."""
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+# 캐시 기본값 - 짧은 TTL로 "더 보기"/재시도 요청만 흡수
+RERANK_CACHE_MAX_ITEMS = 4096
+RERANK_CACHE_TTL_SEC = 20.0
+
+
+class TTLCache:
+    """만료 시간이 있는 LRU 캐시
+
+    항목은 ttl_sec 이 지나면 만료되며, max_items 를 넘으면 가장 오래 사용되지 않은 항목부터 제거된다.
+    """
+
+    def __init__(self, max_items: int = RERANK_CACHE_MAX_ITEMS, ttl_sec: float = RERANK_CACHE_TTL_SEC):
+        self.max_items = max_items
+        self.ttl_sec = ttl_sec
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """만료되지 않은 값을 반환, 없거나 만료되었으면 None"""
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """값 저장 (용량 초과 시 가장 오래된 항목 제거)"""
+        self._data[key] = (time.monotonic() + self.ttl_sec, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_items:
+            self._data.popitem(last=False)
+
+
+# 재정렬 결과 캐시 싱글턴 - 키: (쿼리, top_k, 후보 문서 키 집합)
+rerank_cache = TTLCache()
@@ -3,6 +3,7 @@
 # from typing import List # 이미 불필요
 
 from fastapi import UploadFile # HTTPException은 사용자가 이전에 제거함
+import asyncio
 import logging
 import uuid
 import tempfile
@@ -17,11 +18,16 @@ from app.config.opensearch_config import INDEX_MAP # MASTER_INDEX는 settings에
 from app.models.document_model import UploadResponse, MultiUploadResponse, FileUploadResult
 from app.models import vector_store as vector_store_module # VectorStore 클래스 대신 vector_store 모듈을 임포트
 from app.config.settings import get_settings
+from app.utils.uring_writer import write_upload
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 vector_store = vector_store_module # DocumentService에서 사용할 vector_store가 임포트한 모듈을 가리키도록 함
 
+# 다중 업로드 시 동시에 처리할 최대 파일 수
+# (파일마다 DoclingLoader가 별도 스레드에서 자체 모델로 파싱하므로 메모리를 고려해 작게 유지)
+MAX_CONCURRENT_UPLOADS = 2
+
 class DocumentService:
     async def process_upload(self, file: UploadFile, index_name: str) -> UploadResponse:
         """단일 파일 업로드 처리"""
@@ -35,27 +41,32 @@ class DocumentService:
             logger.error(f"Invalid index_name: {index_name}. Must be one of {list(INDEX_MAP.keys())}")
             raise ValueError(f"잘못된 인덱스 이름입니다: {index_name}")
         
+        # 파일별 처리를 동시에 실행하되 동시 처리 개수는 세마포어로 제한
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_UPLOADS)
+        outcomes = await asyncio.gather(
+            *(self._process_with_limit(file, index_name, semaphore) for file in files),
+            return_exceptions=True
+        )
+        
         results = []
         total_chunks = 0
         
-        for file in files:
-            try:
-                logger.info(f"Processing file: {file.filename}")
-                result = await self._process_single_file(file, index_name)
-                results.append(FileUploadResult(
-                    filename=file.filename,
-                    chunks=result.chunks,
-                    success=True
-                ))
-                total_chunks += result.chunks
-            except Exception as e:
-                logger.error(f"Error processing file {file.filename}: {e}", exc_info=True)
+        for file, outcome in zip(files, outcomes):
+            if isinstance(outcome, BaseException):
+                # 상세 오류와 스택은 _process_single_file에서 이미 기록됨
                 results.append(FileUploadResult(
                     filename=file.filename,
                     chunks=0,
                     success=False,
-                    error=str(e)
+                    error=str(outcome)
                 ))
+                continue
+            results.append(FileUploadResult(
+                filename=file.filename,
+                chunks=outcome.chunks,
+                success=True
+            ))
+            total_chunks += outcome.chunks
         
         return MultiUploadResponse(
             index=index_name,
@@ -63,6 +74,85 @@ class DocumentService:
             files=results
         )
     
+    async def _process_with_limit(self, file: UploadFile, index_name: str, semaphore: asyncio.Semaphore) -> UploadResponse:
+        """세마포어를 획득한 뒤 단일 파일 처리"""
+        async with semaphore:
+            logger.info(f"Processing file: {file.filename}")
+            return await self._process_single_file(file, index_name)
+
+    def _load_and_chunk(self, temp_file_path: str, file: UploadFile, index_name: str, main_doc_id: str) -> List[Document]:
+        """PDF 파싱(DoclingLoader) → kiwi.space() 전처리 → 청크 Document 생성
+
+        모두 CPU를 오래 쓰는 블로킹 작업이므로 _process_single_file에서 워커 스레드로 실행한다.
+        """
+        documents_to_store: List[Document] = []
+
+        # DoclingLoader를 사용하여 문서 로드
+        loader = DoclingLoader(temp_file_path)
+        loaded_documents_from_docling = loader.load() # List[langchain_core.documents.Document]
+        
+        if not loaded_documents_from_docling:
+            logger.warning(f"No documents were loaded from '{file.filename}' by DoclingLoader.")
+            return documents_to_store
+
+        logger.info(f"DoclingLoader loaded {len(loaded_documents_from_docling)} sections from '{file.filename}'.")
+
+        # Kiwi 초기화 (kiwi.space 전처리용)
+        try:
+            kiwi = Kiwi()
+            logger.info("Kiwi initialized for kiwi.space() preprocessing.")
+        except Exception as e:
+            logger.error(f"Failed to initialize Kiwi: {e}", exc_info=True)
+            # Kiwi 초기화 실패 시 오류 발생 또는 다른 처리 필요
+            raise ValueError(f"Kiwi 초기화 중 오류 발생: {str(e)}")
+
+        # 각 page_content를 하나의 청크로 처리하고 kiwi.space() 적용
+        for i, doc_from_docling in enumerate(loaded_documents_from_docling):
+            original_page_content = doc_from_docling.page_content
+
+            if not original_page_content or not original_page_content.strip():
+                logger.warning(f"Skipping empty page_content from DoclingLoader (pre-chunk index {i}) for file '{file.filename}'.")
+                continue
+            
+            # kiwi.space()로 전처리
+            try:
+                processed_chunk_text = kiwi.space(original_page_content)
+            except Exception as e:
+                logger.error(f"Error during kiwi.space() for pre-chunk {i} from '{file.filename}': {e}", exc_info=True)
+                processed_chunk_text = original_page_content # 오류 시 원본 사용 (선택적)
+                logger.warning(f"Using original content for pre-chunk {i} due to kiwi.space() error.")
+
+            if not processed_chunk_text.strip():
+                logger.warning(f"Skipping pre-chunk {i} for '{file.filename}' as it became empty after kiwi.space().")
+                continue
+
+            # 메타데이터 준비 (기존 DoclingLoader 메타데이터 복사)
+            final_metadata = doc_from_docling.metadata.copy() if doc_from_docling.metadata else {}
+
+            # dl_meta 필드 제거 (사용자 요청)
+            final_metadata.pop("dl_meta", None)
+
+            # 현재 시간 가져오기 (ISO 형식)
+            current_time = datetime.now(timezone.utc).isoformat()
+
+            # 추가 메타데이터 설정
+            final_metadata["doc_id"] = main_doc_id
+            final_metadata["chunk_id"] = f"{main_doc_id}_{i}"  # chunk_id 추가
+            final_metadata["chunk_index"] = i  # 청크 인덱스 추가
+            final_metadata["original_file_name"] = file.filename
+            final_metadata["doc_name"] = file.filename  # 문서 이름으로 파일 이름 사용
+            final_metadata["original_collection"] = index_name  # 원본 커렉션 이름 저장
+            final_metadata["upload_timestamp"] = current_time  # 업로드 시간 추가
+            final_metadata["source"] = file.filename  # source에도 파일명 사용
+
+            document_for_opensearch = Document(
+                page_content=processed_chunk_text,
+                metadata=final_metadata
+            )
+            documents_to_store.append(document_for_opensearch)
+
+        return documents_to_store
+
     async def _process_single_file(self, file: UploadFile, index_name: str) -> UploadResponse:
         logger.info(f"Starting Stage 2: Processing file {file.filename} for index {index_name}")
 
@@ -75,76 +165,16 @@ class DocumentService:
 
         temp_file_path = None
         try:
-            # 임시 파일 생성 및 저장
+            # 임시 파일 생성 후 업로드 내용을 청크 단위로 스트리밍 저장 (전체 파일을 메모리에 올리지 않음)
             with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_file:
-                content = await file.read()
-                tmp_file.write(content)
                 temp_file_path = tmp_file.name
+            await write_upload(temp_file_path, file)
             logger.info(f"Uploaded file '{file.filename}' saved temporarily to '{temp_file_path}'.")
 
-            # DoclingLoader를 사용하여 문서 로드
-            loader = DoclingLoader(temp_file_path)
-            loaded_documents_from_docling = loader.load() # List[langchain_core.documents.Document]
-            
-            if not loaded_documents_from_docling:
-                logger.warning(f"No documents were loaded from '{file.filename}' by DoclingLoader.")
-                return UploadResponse(index=index_name, chunks=0)
-
-            logger.info(f"DoclingLoader loaded {len(loaded_documents_from_docling)} sections from '{file.filename}'.")
-
-            # Kiwi 초기화 (kiwi.space 전처리용)
-            try:
-                kiwi = Kiwi()
-                logger.info("Kiwi initialized for kiwi.space() preprocessing.")
-            except Exception as e:
-                logger.error(f"Failed to initialize Kiwi: {e}", exc_info=True)
-                # Kiwi 초기화 실패 시 오류 발생 또는 다른 처리 필요
-                raise ValueError(f"Kiwi 초기화 중 오류 발생: {str(e)}")
-
-            # 각 page_content를 하나의 청크로 처리하고 kiwi.space() 적용
-            for i, doc_from_docling in enumerate(loaded_documents_from_docling):
-                original_page_content = doc_from_docling.page_content
-
-                if not original_page_content or not original_page_content.strip():
-                    logger.warning(f"Skipping empty page_content from DoclingLoader (pre-chunk index {i}) for file '{file.filename}'.")
-                    continue
-                
-                # kiwi.space()로 전처리
-                try:
-                    processed_chunk_text = kiwi.space(original_page_content)
-                except Exception as e:
-                    logger.error(f"Error during kiwi.space() for pre-chunk {i} from '{file.filename}': {e}", exc_info=True)
-                    processed_chunk_text = original_page_content # 오류 시 원본 사용 (선택적)
-                    logger.warning(f"Using original content for pre-chunk {i} due to kiwi.space() error.")
-
-                if not processed_chunk_text.strip():
-                    logger.warning(f"Skipping pre-chunk {i} for '{file.filename}' as it became empty after kiwi.space().")
-                    continue
-
-                # 메타데이터 준비 (기존 DoclingLoader 메타데이터 복사)
-                final_metadata = doc_from_docling.metadata.copy() if doc_from_docling.metadata else {}
-
-                # dl_meta 필드 제거 (사용자 요청)
-                final_metadata.pop("dl_meta", None)
-
-                # 현재 시간 가져오기 (ISO 형식)
-                current_time = datetime.now(timezone.utc).isoformat()
-
-                # 추가 메타데이터 설정
-                final_metadata["doc_id"] = main_doc_id
-                final_metadata["chunk_id"] = f"{main_doc_id}_{i}"  # chunk_id 추가
-                final_metadata["chunk_index"] = i  # 청크 인덱스 추가
-                final_metadata["original_file_name"] = file.filename
-                final_metadata["doc_name"] = file.filename  # 문서 이름으로 파일 이름 사용
-                final_metadata["original_collection"] = index_name  # 원본 커렉션 이름 저장
-                final_metadata["upload_timestamp"] = current_time  # 업로드 시간 추가
-                final_metadata["source"] = file.filename  # source에도 파일명 사용
-
-                document_for_opensearch = Document(
-                    page_content=processed_chunk_text,
-                    metadata=final_metadata
-                )
-                documents_to_store.append(document_for_opensearch)
+            # PDF 파싱과 Kiwi 전처리는 블로킹 작업이므로 이벤트 루프를 막지 않도록 스레드에서 실행
+            documents_to_store = await asyncio.to_thread(
+                self._load_and_chunk, temp_file_path, file, index_name, main_doc_id
+            )
             
             if not documents_to_store:
                 logger.warning(f"No processable chunks found for '{file.filename}' after DoclingLoader and kiwi.space() processing.")
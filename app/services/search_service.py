@@ -1,16 +1,32 @@
 """벡터 & 하이브리드 검색 로직."""
-from typing import List, Dict, Any
+import asyncio
+import logging
+from typing import List, Dict, Any, Optional, Tuple
+
+import numpy as np
 
 from app.config.opensearch_config import MASTER_INDEX
+from app.config.settings import get_settings
 from app.models.search_model import SearchRequest, SearchResponse, SearchResult
 from app.models.vector_store import vector_store
-from app.models.embedding_model import embedding_model
-from app.models.reranker_model import rerank_results
+from app.models.reranker_model import arerank_results
+from app.services._embed_cache import get_cached_embedding
+from app.services._rerank_cache import rerank_cache
+from app.utils.query_utils import is_filename_query, is_literal_query, unquote_phrase
+
+logger = logging.getLogger(__name__)
+
+# RRF 상수 (일반적으로 사용되는 k=60) 및 재정렬 후보 상한
+RRF_K = 60
+RRF_MAX_CANDIDATES = 30
+
+# 파일명이 저장되는 keyword 필드 (파일명 쿼리 검색 대상)
+_FILENAME_FIELDS = ["doc_name", "original_file_name"]
 
 
 class SearchService:
     async def vector_search(self, request: SearchRequest) -> SearchResponse:
-        query_vec = embedding_model.embed_query(request.query)
+        query_vec = get_cached_embedding(request.query)
         results = vector_store.similarity_search(query_vec, index_name=MASTER_INDEX, k=request.top_k)
         return self._to_response(results)
         
@@ -24,10 +40,12 @@ class SearchService:
         
         # 점수 정규화 - 최대 점수로 나누어 0~1 범위로 조정
         if results:
-            max_score = max([result.score for result in results])
+            scores = np.fromiter((result.score for result in results), dtype=np.float64, count=len(results))
+            max_score = scores.max()
             if max_score > 0:
-                for result in results:
-                    result.score = result.score / max_score
+                scores /= max_score
+                for result, score in zip(results, scores.tolist()):
+                    result.score = score
         
         return self._to_response(results)
 
@@ -36,11 +54,11 @@ class SearchService:
         OpenSearch 내장 하이브리드 검색 기능을 사용하여 벡터와 BM25 검색을 합체합니다.
         OpenSearch 검색 파이프라인을 통해 가중치와 점수 정규화를 수행합니다.
         """
-        print(f"\n\n===== OpenSearch 내장 하이브리드 검색 시작: 쿼리='{request.query}', top_k={request.top_k} =====", flush=True)
+        logger.debug("OpenSearch 내장 하이브리드 검색 시작: 쿼리='%s', top_k=%d", request.query, request.top_k)
         
         try:
             # 쿼리 텍스트에서 임베딩 생성
-            query_vec = embedding_model.embed_query(request.query)
+            query_vec = get_cached_embedding(request.query)
             
             # OpenSearch 내장 하이브리드 검색 수행
             results = vector_store.hybrid_search_with_pipeline(
@@ -51,18 +69,15 @@ class SearchService:
                 k=request.top_k
             )
             
-            print(f"\n* OpenSearch 내장 하이브리드 검색 결과: {len(results)} 개", flush=True)
-            for i, doc in enumerate(results[:5]):  # 처음 5개만 출력
-                print(f"  - 결과[{i}]: ID={doc.metadata.doc_id}, 점수={doc.score:.4f}, 청크={doc.metadata.chunk_index}", flush=True)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"OpenSearch 내장 하이브리드 검색 결과: {len(results)} 개")
+                for i, doc in enumerate(results[:5]):  # 처음 5개만 출력
+                    logger.debug(f"  - 결과[{i}]: ID={doc.metadata.doc_id}, 점수={doc.score:.4f}, 청크={doc.metadata.chunk_index}")
             
-            print("===== OpenSearch 내장 하이브리드 검색 완료 =====\n\n", flush=True)
             return self._to_response(results)
             
-        except Exception as e:
-            import traceback
-            print(f"\n* OpenSearch 내장 하이브리드 검색 오류: {str(e)}", flush=True)
-            traceback.print_exc()
-            print("===== 하이브리드 검색 오류 완료 =====\n\n", flush=True)
+        except Exception:
+            logger.exception("OpenSearch 내장 하이브리드 검색 오류", extra={"query": request.query, "top_k": request.top_k})
             raise
     
 
@@ -71,71 +86,109 @@ class SearchService:
         """벡터 검색과 키워드 검색 결과를 크로스 인코더로 재정렬하는 하이브리드 검색
         
         1. 벡터 검색과 BM25 검색을 수행하여 결과 추출
-        2. 결과를 크로스 인코더 모델을 통해 재정렬 (BAAI/bge-reranker-v2-m3 모델 사용)
+        2. RRF로 두 결과를 합친 뒤 상위 후보를 크로스 인코더 모델을 통해 재정렬 (BAAI/bge-reranker-v2-m3 모델 사용)
         3. 재정렬된 결과를 반환
         """
-        print(f"\n\n===== 재정렬 하이브리드 검색 시작: 쿼리='{request.query}', top_k={request.top_k} =====", flush=True)
+        logger.debug("재정렬 하이브리드 검색 시작: 쿼리='%s', top_k=%d", request.query, request.top_k)
         
+        settings = get_settings()
         try:
-            # 1. 벡터 검색 수행 (재정렬을 위해 더 많은 후보 가져오기)
-            expanded_k = max(request.top_k * 3, 30)  # 재정렬을 위해 더 많은 후보 가져오기
-            query_vec = embedding_model.embed_query(request.query)
-            vector_results = vector_store.similarity_search(query_vec, index_name=MASTER_INDEX, k=expanded_k)
-            print(f"\n* 벡터 검색 결과: {len(vector_results)} 개", flush=True)
-            for i, doc in enumerate(vector_results[:3]):  # 처음 3개만 출력
-                print(f"  - 벡터[{i}]: ID={doc.metadata.doc_id}, 점수={doc.score:.4f}, 청크={doc.metadata.chunk_index}", flush=True)
+            # 0. 리터럴 쿼리는 BM25 결과가 곧 정답 순서이므로 벡터 검색과 재정렬 생략
+            #    따옴표로 감싼 쿼리는 따옴표를 벗겨 구문(match_phrase) 검색,
+            #    파일명 쿼리는 본문이 아닌 파일명 keyword 필드에서 정확 일치 검색으로 수행
+            if is_literal_query(request.query, allow_single_token=settings.rerank_skip_single_token):
+                phrase = unquote_phrase(request.query)
+                filename_fields = _FILENAME_FIELDS if phrase is None and is_filename_query(request.query) else None
+                bm25_results = await asyncio.to_thread(
+                    vector_store.bm25_search,
+                    phrase or request.query.strip(),
+                    index_name=MASTER_INDEX,
+                    k=request.top_k,
+                    phrase=phrase is not None,
+                    fields=filename_fields,
+                )
+                logger.debug("리터럴 쿼리 - BM25 결과 %d 개 반환, 재정렬 스킵", len(bm25_results))
+                return self._to_response(bm25_results[:request.top_k])
+            
+            # 1. 벡터 검색과 BM25 검색을 병렬로 수행 (재정렬을 위해 더 많은 후보 가져오기)
+            # RRF는 순위만 사용하고 상위 RRF_MAX_CANDIDATES 개만 재정렬하므로 검색기별 3배 오버샘플링은 불필요.
+            # 2배(최소 25개)로 줄여 OpenSearch 스코어링·전송량을 절감 (재현율이 떨어지면 이 값을 조정)
+            expanded_k = max(request.top_k * 2, 25)
+            # 1.1 쿼리 임베딩과 BM25 검색을 동시에 시작 (BM25는 임베딩이 필요 없음)
+            bm25_task = asyncio.create_task(
+                asyncio.to_thread(vector_store.bm25_search, request.query, index_name=MASTER_INDEX, k=expanded_k)
+            )
+            try:
+                query_vec = await asyncio.to_thread(get_cached_embedding, request.query)
+                vector_task = asyncio.to_thread(vector_store.similarity_search, query_vec, index_name=MASTER_INDEX, k=expanded_k)
+                # 2. 벡터 검색과 BM25 검색 결과를 함께 대기
+                vector_results, bm25_results = await asyncio.gather(vector_task, bm25_task)
+            except BaseException:
+                bm25_task.cancel()  # 임베딩/벡터 검색 실패 시 BM25 태스크 정리
+                raise
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"벡터 검색 결과: {len(vector_results)} 개")
+                for i, doc in enumerate(vector_results[:3]):  # 처음 3개만 출력
+                    logger.debug(f"  - 벡터[{i}]: ID={doc.metadata.doc_id}, 점수={doc.score:.4f}, 청크={doc.metadata.chunk_index}")
+                logger.debug(f"BM25 검색 결과: {len(bm25_results)} 개")
+                for i, doc in enumerate(bm25_results[:3]):  # 처음 3개만 출력
+                    logger.debug(f"  - BM25[{i}]: ID={doc.metadata.doc_id}, 점수={doc.score:.4f}, 청크={doc.metadata.chunk_index}")
             
-            # 2. BM25 검색 수행
-            bm25_results = vector_store.bm25_search(request.query, index_name=MASTER_INDEX, k=expanded_k)
-            print(f"\n* BM25 검색 결과: {len(bm25_results)} 개", flush=True)
-            for i, doc in enumerate(bm25_results[:3]):  # 처음 3개만 출력
-                print(f"  - BM25[{i}]: ID={doc.metadata.doc_id}, 점수={doc.score:.4f}, 청크={doc.metadata.chunk_index}", flush=True)
+            # 2.1 문서 키(doc_id, chunk_index)를 한 번만 계산해 이후 일치 검사·RRF·캐시 키에 재사용
+            vector_keyed = [((d.metadata.doc_id, d.metadata.chunk_index), d) for d in vector_results]
+            bm25_keyed = [((d.metadata.doc_id, d.metadata.chunk_index), d) for d in bm25_results]
             
-            # 3. 중복 제거하면서 결과 합치기
-            combined_docs = []
-            doc_ids_chunks = set()  # doc_id + chunk_index 기준으로 중복 체크
+            # 2.2 두 검색기의 상위 top_k가 거의 일치하면 재정렬로 순서가 바뀔 여지가 적으므로 생략
+            if settings.rerank_skip_on_agreement:
+                vector_top = {doc_key for doc_key, _ in vector_keyed[:request.top_k]}
+                bm25_top = {doc_key for doc_key, _ in bm25_keyed[:request.top_k]}
+                union = vector_top | bm25_top
+                if union and len(vector_top & bm25_top) / len(union) > settings.rerank_agreement_threshold:
+                    logger.debug("벡터/BM25 상위 결과 일치 - 재정렬 스킵")
+                    return self._to_response(vector_results[:request.top_k])
             
-            # 3.1 벡터 검색 결과 추가
-            for doc in vector_results:
-                # doc_id와 chunk_index를 함께 사용하여 중복 확인
-                doc_key = f"{doc.metadata.doc_id}_{doc.metadata.chunk_index}"
-                if doc_key in doc_ids_chunks:
-                    continue
-                combined_docs.append(doc)
-                doc_ids_chunks.add(doc_key)
+            # 3. RRF(Reciprocal Rank Fusion)로 결과 합치기
+            #    score = Σ 1 / (RRF_K + rank), 한쪽 결과에만 있는 문서는 해당 항목만 더함
+            rrf_scores: Dict[Tuple[str, Optional[int]], float] = {}
+            docs_by_key: Dict[Tuple[str, Optional[int]], SearchResult] = {}
+            for keyed in (vector_keyed, bm25_keyed):
+                for rank, (doc_key, doc) in enumerate(keyed, start=1):
+                    rrf_scores[doc_key] = rrf_scores.get(doc_key, 0.0) + 1.0 / (RRF_K + rank)
+                    docs_by_key.setdefault(doc_key, doc)
             
-            # 3.2 BM25 검색 결과 추가
-            for doc in bm25_results:
-                doc_key = f"{doc.metadata.doc_id}_{doc.metadata.chunk_index}"
-                if doc_key in doc_ids_chunks:
-                    continue
-                combined_docs.append(doc)
-                doc_ids_chunks.add(doc_key)
+            # 3.1 RRF 상위 후보만 크로스 인코더로 전달 (top_k보다 적게 자르지는 않음)
+            fused_k = max(request.top_k, min(request.top_k * 2, RRF_MAX_CANDIDATES))
+            fused_keys = sorted(rrf_scores, key=rrf_scores.get, reverse=True)[:fused_k]
+            combined_docs = [docs_by_key[doc_key] for doc_key in fused_keys]
             
-            print(f"\n* 총 재정렬 대상 문서: {len(combined_docs)} 개", flush=True)
+            logger.debug("총 재정렬 대상 문서: %d 개", len(combined_docs))
             
             # 4. 결과가 없으면 빈 결과 반환
             if not combined_docs:
-                print("* 결과 없음 - 재정렬 스킵", flush=True)
+                logger.debug("결과 없음 - 재정렬 스킵")
                 return self._to_response([])
             
-            # 5. 크로스 인코더로 재정렬 수행
-            print("* 크로스 인코더 재정렬 수행 중...", flush=True)
-            from app.models.reranker_model import rerank_results
-            reranked_docs = rerank_results(request.query, combined_docs, request.top_k)
+            # 5. 크로스 인코더로 재정렬 수행 (같은 쿼리·후보 조합이면 캐시 사용)
+            cache_key = (request.query, request.top_k, frozenset(fused_keys))
+            reranked_docs = rerank_cache.get(cache_key)
+            if reranked_docs is None:
+                logger.debug("크로스 인코더 재정렬 수행 중...")
+                reranked_docs, reranked = await arerank_results(request.query, combined_docs, request.top_k)
+                if reranked:  # 폴백(원래 점수 정렬) 결과는 캐시하지 않음
+                    rerank_cache.set(cache_key, reranked_docs)
+            else:
+                logger.debug("재정렬 캐시 적중 - 크로스 인코더 스킵")
+            reranked_docs = list(reranked_docs)
             
-            print(f"\n* 최종 재정렬 결과: {len(reranked_docs)} 개", flush=True)
-            for i, doc in enumerate(reranked_docs[:5]):  # 처음 5개만 출력
-                print(f"  - 결과[{i}]: ID={doc.metadata.doc_id}, 점수={doc.score:.4f}, 청크={doc.metadata.chunk_index}", flush=True)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"최종 재정렬 결과: {len(reranked_docs)} 개")
+                for i, doc in enumerate(reranked_docs[:5]):  # 처음 5개만 출력
+                    logger.debug(f"  - 결과[{i}]: ID={doc.metadata.doc_id}, 점수={doc.score:.4f}, 청크={doc.metadata.chunk_index}")
             
-            print("===== 재정렬 하이브리드 검색 완료 =====\n\n", flush=True)
             return self._to_response(reranked_docs)
             
-        except Exception as e:
-            import traceback
-            print(f"\n* 재정렬 하이브리드 검색 오류: {str(e)}", flush=True)
-            traceback.print_exc()
-            print("===== 재정렬 하이브리드 검색 오류 완료 =====\n\n", flush=True)
+        except Exception:
+            logger.exception("재정렬 하이브리드 검색 오류", extra={"query": request.query, "top_k": request.top_k})
             raise
 
     def _to_response(self, results: List[SearchResult]) -> SearchResponse:
@@ -0,0 +1,43 @@
+""" 검색 쿼리 형태 판별 유틸리티. """
+import re
+from typing import Optional
+
+# 파일명 형태: "보고서_2024.pdf" 등 - 업로드 대상 문서 확장자만 허용해 "3.14", "Node.js" 같은 일반 쿼리는 제외
+_FILENAME_PATTERN = re.compile(r"\S+\.(?:pdf|docx?|pptx?|xlsx?|hwpx?|txt|md)", re.IGNORECASE)
+_LITERAL_TOKEN_MAX_LEN = 24
+_QUOTE_CHARS = "\"'"
+
+
+def unquote_phrase(query: str) -> Optional[str]:
+    """따옴표로 감싼 단일 구문이면 따옴표를 벗긴 구문을, 아니면 None을 반환
+
+    '"a" 와 "b"' 처럼 안쪽에 같은 따옴표가 더 있으면 여러 구문이므로 None.
+    """
+    q = query.strip()
+    if len(q) >= 2 and q[0] == q[-1] and q[0] in _QUOTE_CHARS:
+        phrase = q[1:-1].strip()
+        if q[0] in phrase:
+            return None
+        return phrase or None
+    return None
+
+
+def is_filename_query(query: str) -> bool:
+    """문서 파일명 형태의 쿼리인지 판별"""
+    return _FILENAME_PATTERN.fullmatch(query.strip()) is not None
+
+
+def is_literal_query(query: str, allow_single_token: bool = False) -> bool:
+    """BM25 순서만으로 충분한 리터럴 쿼리인지 판별
+
+    따옴표로 감싼 구문, 파일명이면 True.
+    allow_single_token 이 True이면 공백 없는 짧은 단일 토큰(태그 등)도 True.
+    """
+    q = query.strip()
+    if unquote_phrase(q) is not None:
+        return True
+    if is_filename_query(q):
+        return True
+    if not allow_single_token:
+        return False
+    return bool(q) and len(q) < _LITERAL_TOKEN_MAX_LEN and not any(ch.isspace() for ch in q)
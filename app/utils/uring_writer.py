@@ -0,0 +1,154 @@
+""" 업로드 파일 디스크 저장 유틸리티 (Linux io_uring 우선, aiofiles 폴백). """
+import asyncio
+import logging
+import os
+import platform
+import sys
+from functools import lru_cache
+from typing import Dict, List
+
+import aiofiles
+from fastapi import UploadFile
+
+try:  # 선택적 의존성 - 설치되어 있지 않으면 aiofiles 경로 사용
+    import liburing
+except ImportError:  # pragma: no cover - 환경에 따라 다름
+    liburing = None
+
+logger = logging.getLogger(__name__)
+
+WRITE_CHUNK_SIZE = 1024 * 1024  # aiofiles 경로에서 한 번에 읽고 쓰는 크기 (1MB)
+URING_BUFFER_SIZE = 256 * 1024  # io_uring 경로의 재사용 버퍼 크기
+URING_BUFFER_COUNT = 4          # 동시에 진행 중인 쓰기 수 (업로드당 최대 1MB 버퍼)
+_MIN_KERNEL = (5, 6)            # io_uring 파일 쓰기가 안정적인 최소 커널 버전
+
+# 런타임에 링 생성이 막혀 있으면(예: Docker 기본 seccomp 프로필) 첫 실패 이후 io_uring 경로를 끈다
+_uring_disabled = False
+
+
+class _UringSetupError(OSError):
+    """io_uring 링 생성 실패 (환경 문제이므로 이후 업로드에서도 재시도하지 않음)"""
+
+
+@lru_cache(maxsize=1)
+def _uring_available() -> bool:
+    """liburing 임포트 가능 여부와 커널 버전으로 io_uring 사용 가능 여부 판단"""
+    if liburing is None or not sys.platform.startswith("linux"):
+        return False
+    try:
+        major, minor = (int(part) for part in platform.release().split(".")[:2])
+    except ValueError:
+        return False
+    return (major, minor) >= _MIN_KERNEL
+
+
+def _prep_write(ring, fd: int, slot: int, view: memoryview, offset: int) -> None:
+    """slot 버퍼의 view를 offset 위치에 쓰는 SQE 준비 (완료 시 slot 번호로 식별)"""
+    sqe = liburing.io_uring_get_sqe(ring)
+    liburing.io_uring_prep_write(sqe, fd, view, len(view), offset)
+    liburing.io_uring_sqe_set_data64(sqe, slot)
+
+
+def _read_into(source, buf: bytearray) -> int:
+    """source에서 buf 크기만큼 읽어 buf에 채우고 읽은 바이트 수 반환"""
+    readinto = getattr(source, "readinto", None)
+    if readinto is not None:
+        return readinto(buf) or 0
+    chunk = source.read(len(buf))
+    buf[:len(chunk)] = chunk
+    return len(chunk)
+
+
+def _write_with_uring(path: str, source) -> int:
+    """동기 파일 객체(source)의 내용을 io_uring으로 path에 기록 (워커 스레드에서 실행)
+
+    URING_BUFFER_COUNT 개의 고정 버퍼를 재사용해 진행 중인 쓰기 용량을
+    URING_BUFFER_COUNT * URING_BUFFER_SIZE 로 제한하면서, 이전 쓰기가 끝나기를 기다리는 동안
+    다음 청크를 읽어 제출한다.
+    """
+    ring = liburing.io_uring()
+    cqe = liburing.io_uring_cqe()
+    try:
+        liburing.io_uring_queue_init(URING_BUFFER_COUNT, ring, 0)
+    except Exception as e:
+        raise _UringSetupError(f"io_uring_queue_init failed: {e}") from e
+    fd = -1
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        buffers = [bytearray(URING_BUFFER_SIZE) for _ in range(URING_BUFFER_COUNT)]
+        # slot -> [파일 오프셋, 유효 길이, 기록 완료 바이트]
+        pending: Dict[int, List[int]] = {}
+        free_slots = list(range(URING_BUFFER_COUNT))
+        offset = 0
+        eof = False
+
+        while not eof or pending:
+            # 빈 버퍼가 있는 동안 읽어서 제출
+            submitted = False
+            while free_slots and not eof:
+                slot = free_slots.pop()
+                length = _read_into(source, buffers[slot])
+                if length == 0:
+                    free_slots.append(slot)
+                    eof = True
+                    break
+                _prep_write(ring, fd, slot, memoryview(buffers[slot])[:length], offset)
+                pending[slot] = [offset, length, 0]
+                offset += length
+                submitted = True
+            if submitted:
+                liburing.io_uring_submit(ring)
+            if not pending:
+                continue
+
+            # 완료 하나를 기다려 검증하고, 짧은 쓰기는 남은 부분을 다시 제출
+            liburing.io_uring_wait_cqe(ring, cqe)
+            result, slot = cqe.res, cqe.user_data
+            liburing.io_uring_cqe_seen(ring, cqe)
+            if result < 0:
+                raise OSError(-result, os.strerror(-result))
+            state = pending[slot]
+            state[2] += result
+            if state[2] == state[1]:
+                del pending[slot]
+                free_slots.append(slot)
+            elif result == 0:
+                raise OSError(f"io_uring write made no progress at offset {state[0] + state[2]} of '{path}'")
+            else:
+                _prep_write(ring, fd, slot, memoryview(buffers[slot])[state[2]:state[1]], state[0] + state[2])
+                liburing.io_uring_submit(ring)
+        return offset
+    finally:
+        if fd >= 0:
+            os.close(fd)
+        liburing.io_uring_queue_exit(ring)
+
+
+async def _write_with_aiofiles(path: str, upload: UploadFile) -> int:
+    """UploadFile 내용을 청크 단위로 aiofiles를 통해 기록"""
+    written = 0
+    async with aiofiles.open(path, "wb") as out_file:
+        while chunk := await upload.read(WRITE_CHUNK_SIZE):
+            await out_file.write(chunk)
+            written += len(chunk)
+    return written
+
+
+async def write_upload(path: str, upload: UploadFile) -> int:
+    """업로드 파일을 path에 저장하고 기록한 바이트 수를 반환
+
+    Linux 5.6 이상에서 liburing이 설치되어 있으면 스레드 한 번 전환으로 전체 쓰기를
+    고정 버퍼 링을 통해 io_uring에 제출하고, 그렇지 않으면 aiofiles로 청크 단위 저장한다.
+    """
+    global _uring_disabled
+    if _uring_available() and not _uring_disabled:
+        try:
+            return await asyncio.to_thread(_write_with_uring, path, upload.file)
+        except _UringSetupError as e:
+            _uring_disabled = True
+            logger.warning(f"io_uring unavailable, using aiofiles for all uploads from now on: {e}")
+            await upload.seek(0)
+        except Exception as e:
+            logger.warning(f"io_uring write failed for '{path}', falling back to aiofiles: {e}")
+            await upload.seek(0)
+    return await _write_with_aiofiles(path, upload)
@@ -0,0 +1,45 @@
+from app.utils.query_utils import is_filename_query, is_literal_query, unquote_phrase
+
+
+def test_quoted_phrase_is_literal():
+    assert is_literal_query('"정보 보안 정책"')
+    assert is_literal_query("'incident response'")
+    assert unquote_phrase(' "정보 보안 정책" ') == "정보 보안 정책"
+
+
+def test_empty_quotes_are_not_literal():
+    assert not is_literal_query('""')
+    assert unquote_phrase('" "') is None
+
+
+def test_multiple_quoted_phrases_are_not_one_phrase():
+    assert unquote_phrase('"a" 와 "b"') is None
+    assert not is_literal_query('"a" 와 "b"')
+
+
+def test_filename_is_literal():
+    assert is_literal_query("report_2024.pdf")
+    assert is_literal_query("보안정책_v2.docx")
+    assert is_filename_query("보고서_2024.PDF")
+    assert unquote_phrase("report_2024.pdf") is None
+
+
+def test_dotted_terms_are_not_filenames():
+    for query in ["3.14", "Node.js", "example.com", "Python3.11", "ver1.10"]:
+        assert not is_filename_query(query)
+        assert not is_literal_query(query)
+
+
+def test_single_token_requires_opt_in():
+    for query in ["transformer", "머신러닝", "hello?"]:
+        assert not is_literal_query(query)
+        assert is_literal_query(query, allow_single_token=True)
+
+
+def test_long_single_token_is_not_literal():
+    assert not is_literal_query("a" * 30, allow_single_token=True)
+
+
+def test_multi_word_query_is_not_literal():
+    assert not is_literal_query("정보 보안 정책은 무엇인가")
+    assert not is_literal_query("정보 보안 정책은 무엇인가", allow_single_token=True)
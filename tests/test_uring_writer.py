@@ -0,0 +1,130 @@
+import asyncio
+import io
+import os
+import random
+
+import pytest
+from fastapi import UploadFile
+
+from app.utils import uring_writer
+
+
+class _Sqe:
+    def __init__(self):
+        self.args = None
+        self.user_data = None
+
+
+class _Ring:
+    def __init__(self):
+        self.submitted = []
+        self.queued = []
+
+
+class _Cqe:
+    res = 0
+    user_data = 0
+
+
+class FakeLiburing:
+    """liburing 대역 - 제출된 쓰기를 임의 순서로 완료하고 일부는 짧게 기록한다."""
+
+    io_uring = _Ring
+    io_uring_cqe = _Cqe
+
+    def __init__(self, seed=0, short_write=1000, fail_init=False):
+        self.random = random.Random(seed)
+        self.short_write = short_write
+        self.fail_init = fail_init
+        self.exited = False
+        self.init_calls = 0
+
+    def io_uring_queue_init(self, entries, ring, flags):
+        self.init_calls += 1
+        if self.fail_init:
+            raise OSError(1, "Operation not permitted")
+
+    def io_uring_queue_exit(self, ring):
+        self.exited = True
+
+    def io_uring_get_sqe(self, ring):
+        sqe = _Sqe()
+        ring.queued.append(sqe)
+        return sqe
+
+    def io_uring_prep_write(self, sqe, fd, view, length, offset):
+        sqe.args = (fd, bytes(view[:length]), offset)
+
+    def io_uring_sqe_set_data64(self, sqe, data):
+        sqe.user_data = data
+
+    def io_uring_submit(self, ring):
+        ring.submitted.extend(ring.queued)
+        ring.queued.clear()
+
+    def io_uring_wait_cqe(self, ring, cqe):
+        # 제출된 요청 중 임의의 것을 완료 (순서 뒤바뀜), 절반은 짧은 쓰기
+        sqe = ring.submitted.pop(self.random.randrange(len(ring.submitted)))
+        fd, data, offset = sqe.args
+        length = len(data)
+        if length > self.short_write and self.random.random() < 0.5:
+            length = self.short_write
+        cqe.res = os.pwrite(fd, data[:length], offset)
+        cqe.user_data = sqe.user_data
+
+    def io_uring_cqe_seen(self, ring, cqe):
+        pass
+
+
+@pytest.fixture
+def fake_liburing(monkeypatch):
+    fake = FakeLiburing()
+    monkeypatch.setattr(uring_writer, "liburing", fake)
+    monkeypatch.setattr(uring_writer, "_uring_disabled", False)
+    return fake
+
+
+def test_short_and_out_of_order_writes_produce_intact_file(fake_liburing, tmp_path):
+    data = os.urandom(3 * uring_writer.URING_BUFFER_SIZE * uring_writer.URING_BUFFER_COUNT + 123)
+    path = tmp_path / "out.pdf"
+
+    written = uring_writer._write_with_uring(str(path), io.BytesIO(data))
+
+    assert written == len(data)
+    assert path.read_bytes() == data
+    assert fake_liburing.exited
+
+
+def test_zero_progress_write_raises(fake_liburing, tmp_path, monkeypatch):
+    def stalled_wait(ring, cqe):
+        sqe = ring.submitted.pop()
+        cqe.res = 0
+        cqe.user_data = sqe.user_data
+
+    monkeypatch.setattr(fake_liburing, "io_uring_wait_cqe", stalled_wait)
+    with pytest.raises(OSError):
+        uring_writer._write_with_uring(str(tmp_path / "out.pdf"), io.BytesIO(b"data"))
+    assert fake_liburing.exited
+
+
+def test_open_failure_still_exits_ring(fake_liburing, tmp_path):
+    with pytest.raises(FileNotFoundError):
+        uring_writer._write_with_uring(str(tmp_path / "missing" / "out.pdf"), io.BytesIO(b"data"))
+    assert fake_liburing.exited
+
+
+def test_setup_failure_disables_uring_after_first_upload(fake_liburing, tmp_path, monkeypatch):
+    fake_liburing.fail_init = True
+    monkeypatch.setattr(uring_writer, "_uring_available", lambda: True)
+
+    async def upload_twice():
+        for name in ("a.pdf", "b.pdf"):
+            upload = UploadFile(file=io.BytesIO(b"%PDF-1.7 body"), filename=name)
+            await uring_writer.write_upload(str(tmp_path / name), upload)
+
+    asyncio.run(upload_twice())
+
+    assert fake_liburing.init_calls == 1
+    assert uring_writer._uring_disabled
+    assert (tmp_path / "a.pdf").read_bytes() == b"%PDF-1.7 body"
+    assert (tmp_path / "b.pdf").read_bytes() == b"%PDF-1.7 body"